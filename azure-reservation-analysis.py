@@ -4,13 +4,22 @@
 
 
 # Standard library imports
+import argparse
 import os
 import sys
 import subprocess
 import glob
+import importlib.util
+import functools
+import re
 import json
+import math
 import time
+import zipfile
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from xml.sax.saxutils import escape
 
 
 ###############################################################################
@@ -19,7 +28,7 @@ import threading
 
 def install_and_import(package_name, import_name=None):
     """
-    Automatically install and import a package if it's not available.
+    Automatically install a package if it's not available.
     
     Args:
         package_name: The name of the package to install via pip
@@ -28,10 +37,10 @@ def install_and_import(package_name, import_name=None):
     if import_name is None:
         import_name = package_name
     
-    try:
-        __import__(import_name)
+    # find_spec only locates the package; it doesn't execute (import) it
+    if importlib.util.find_spec(import_name) is not None:
         print(f"✓ {package_name} is already installed")
-    except ImportError:
+    else:
         print(f"⚠️ {package_name} not found. Installing...")
         try:
             subprocess.check_call([sys.executable, "-m", "pip", "install", package_name])
@@ -50,7 +59,9 @@ def check_and_install_dependencies():
     required_packages = [
         ("pandas", "pandas"),
         ("openpyxl", "openpyxl"),
+        ("python-calamine", "python_calamine"),
         ("requests", "requests"),
+        ("orjson", "orjson"),
         ("selenium", "selenium"),
     ]
     
@@ -60,25 +71,62 @@ def check_and_install_dependencies():
     print("\n✅ All dependencies are installed!\n")
 
 
-# Check dependencies before importing
-check_and_install_dependencies()
+# Third-party packages are imported inside the functions that use them, so that
+# check_and_install_dependencies() (run from __main__) can install them first and
+# callers that only need e.g. get_prices don't pay for pandas/selenium imports.
+
+
+def read_json(path):
+    """Load a JSON file with orjson"""
+    import orjson
+
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
 
-# Third-party imports (after dependency check)
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from openpyxl import load_workbook
-from openpyxl.styles import Font, Border, Side
-import requests
+def write_json(obj, path, indent=True, sort_keys=False):
+    """Write `obj` to a JSON file with orjson (2-space indented unless `indent` is False)"""
+    import orjson
+
+    option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(obj, option=option))
 
 
 ###############################################################################
 # SECTION 1: VM SUGGESTIONS AND RECOMMENDATIONS
 ###############################################################################
 
+# Columns read from the inventory workbook (everything else is skipped at parse time)
+ADVISOR_COLUMNS = {
+    "Name", "Category", "Impact", "Description", "Quantity",
+    "Annual Savings", "SKU", "Savings Region", "Term",
+}
+VM_COLUMNS = {
+    "VM Name", "VM Size", "OS Type", "OS Name", "Location",
+    "Power State", "Tag Name", "Tag Value", "Creation Time",
+}
+
+
+def get_excel_reader_engine():
+    """Prefer the Rust-based calamine reader (pandas >= 2.2), else fall back to openpyxl"""
+    import pandas as pd
+
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return "openpyxl"
+    pandas_version = tuple(int(part) for part in pd.__version__.split(".")[:2])
+    return "calamine" if pandas_version >= (2, 2) else "openpyxl"
+
+
 def generate_vm_recommendations():
     """Generate VM reservation recommendations from Azure Resource Inventory"""
+    import numpy as np
+    import pandas as pd
+
     print("\n" + "="*80)
     print("SECTION 1: GENERATING VM RESERVATION RECOMMENDATIONS")
     print("="*80 + "\n")
@@ -97,24 +145,25 @@ def generate_vm_recommendations():
     print(f"Processing file: {os.path.basename(file_path)}")
 
     # === Load Workbook ===
-    advisor_df = pd.read_excel(file_path, sheet_name="Advisor")
-    
-    # Try to load VM sheet with both possible names
-    vm_sheet_loaded = None
-    try:
-        vm_df = pd.read_excel(file_path, sheet_name="Virtual Machines")
-        vm_sheet_loaded = "Virtual Machines"
-        print(f"Loaded 'Virtual Machines' sheet")
-    except ValueError:
-        try:
-            vm_df = pd.read_excel(file_path, sheet_name="Virtual Machine Scale Sets")
+    # Open the workbook once and parse each sheet from the same handle,
+    # materializing only the columns the analysis uses
+    with pd.ExcelFile(file_path, engine=get_excel_reader_engine()) as xls:
+        advisor_df = xls.parse("Advisor", usecols=lambda col: col in ADVISOR_COLUMNS)
+        
+        # Load VM sheet with either of the possible names
+        if "Virtual Machines" in xls.sheet_names:
+            vm_sheet_loaded = "Virtual Machines"
+            vm_df = xls.parse(vm_sheet_loaded, usecols=lambda col: col in VM_COLUMNS)
+        elif "Virtual Machine Scale Sets" in xls.sheet_names:
+            # VMSS column names vary, so load the full sheet for normalization below
             vm_sheet_loaded = "Virtual Machine Scale Sets"
-            print(f"Loaded 'Virtual Machine Scale Sets' sheet")
-        except ValueError:
+            vm_df = xls.parse(vm_sheet_loaded)
+        else:
             raise ValueError(
                 "Could not find sheet 'Virtual Machines' or 'Virtual Machine Scale Sets' in the Excel file. "
                 "Please ensure the Azure Resource Inventory file contains one of these sheets."
             )
+    print(f"Loaded '{vm_sheet_loaded}' sheet")
     
     # Normalize column names for Virtual Machine Scale Sets
     if vm_sheet_loaded == "Virtual Machine Scale Sets":
@@ -209,81 +258,94 @@ def generate_vm_recommendations():
         print(f"   Pricing will use compute-only (Linux base) costs as a conservative estimate.")
 
     # === Build VM Pool with Tag Awareness (ApplicationName + CostCenter fallback) ===
-    vm_pool = {}
-    grouped_vms = vm_df.groupby("VM Name")
-
-    for vm_name, group in grouped_vms:
-        vm_size = group["VM Size"].iloc[0] if "VM Size" in group else "Unknown"
-        os_type = group["OS Type"].iloc[0] if "OS Type" in group else "Unknown"
-        os_name = group["OS Name"].iloc[0] if "OS Name" in group else "Unknown"
-        location = group["Location"].iloc[0] if "Location" in group else "Unknown"
-        creation_time = group["Creation Time"].iloc[0] if "Creation Time" in group else "Unknown"
-
-        # Default tag value
-        tag_value = "Unknown"
-
-        # Prefer ApplicationName, else fallback to CostCenter
-        if "Tag Name" in group and "Tag Value" in group:
-            app_row = group[group["Tag Name"] == "ApplicationName"]
-            if not app_row.empty:
-                tag_value = str(app_row["Tag Value"].iloc[0]).strip()
-            else:
-                cost_row = group[group["Tag Name"].isin(["CostCenter", "Cost Center"])]
-                if not cost_row.empty:
-                    tag_value = str(cost_row["Tag Value"].iloc[0]).strip()
-
-        key = (str(vm_size).strip(), str(location).lower().strip())
-        vm_entry = {
-            "VM Name": vm_name,
-            "VM Size": vm_size,
-            "OS": os_type,
-            "OS Name": os_name,
-            "Region": location,
-            "Tags": tag_value,
-            "Creation Time": creation_time,
-        }
-        vm_pool.setdefault(key, []).append(vm_entry)
+    # One row per VM (first inventory row wins), in VM Name order
+    vm_first = vm_df.dropna(subset=["VM Name"]).drop_duplicates("VM Name").set_index("VM Name").sort_index()
+    vms = pd.DataFrame(index=vm_first.index)
+    for column, field in [("VM Size", "VM Size"), ("OS Type", "OS"), ("OS Name", "OS Name"),
+                          ("Location", "Region"), ("Creation Time", "Creation Time")]:
+        vms[field] = vm_first[column] if column in vm_first.columns else "Unknown"
+
+    # Prefer ApplicationName, else fallback to CostCenter
+    vms["Tags"] = "Unknown"
+    if "Tag Name" in vm_df.columns and "Tag Value" in vm_df.columns:
+        def first_tag_value(tag_names):
+            tag_rows = vm_df[vm_df["Tag Name"].isin(tag_names)].drop_duplicates("VM Name")
+            return tag_rows.set_index("VM Name")["Tag Value"].astype(str).str.strip()
+
+        tags = first_tag_value(["ApplicationName"]).combine_first(first_tag_value(["CostCenter", "Cost Center"]))
+        vms["Tags"] = tags.reindex(vms.index).fillna("Unknown")
+
+    vms = vms.reset_index()
+    vms["key_sku"] = vms["VM Size"].astype(str).str.strip()
+    vms["key_region"] = vms["Region"].astype(str).str.lower().str.strip()
 
     # === Build Recommendations ===
-    recommendations = []
-    seen_vms = set()
-
-    for _, adv in advisor_filtered.iterrows():
-        key = (str(adv["SKU"]).strip(), str(adv["Savings Region"]).lower().strip())
-        quantity = int(adv["Quantity"])
-        annual_savings = float(adv["Annual Savings"])
-        term = adv.get("Term", "Unknown")
-        pool = vm_pool.get(key, [])
-
-        selected = 0
-        for vm in pool:
-            if vm["VM Name"] in seen_vms:
-                continue
-            recommendations.append(
+    # Every VM belongs to exactly one (size, region) pool. Advisor rows claim the next
+    # `Quantity` VMs of their pool in order, so number the VMs within each pool and
+    # give each Advisor row the slot range [slot_start, slot_end) it would consume.
+    pool_columns = ["key_sku", "key_region"]
+    vms["slot"] = vms.groupby(pool_columns, sort=False).cumcount()
+
+    adv = advisor_filtered.reset_index(drop=True)
+    adv = adv.assign(
+        key_sku=adv["SKU"].astype(str).str.strip(),
+        key_region=adv["Savings Region"].astype(str).str.lower().str.strip(),
+        quantity=adv["Quantity"].astype(int).clip(lower=1),  # each Advisor row takes at least one VM
+        term=adv["Term"] if "Term" in adv.columns else "Unknown",
+        advisor_order=np.arange(len(adv)),
+    )
+    adv["slot_end"] = adv.groupby(pool_columns, sort=False)["quantity"].cumsum()
+    adv["slot_start"] = adv["slot_end"] - adv["quantity"]
+
+    # Map each VM slot to the Advisor row whose range covers it, without pairing every
+    # Advisor row with every VM of its pool: number the pools, encode (pool, slot) as
+    # one integer and binary-search it among the Advisor rows' (pool, slot_end) codes.
+    pool_codes = (
+        pd.concat([vms[pool_columns], adv[pool_columns]], ignore_index=True)
+        .groupby(pool_columns, sort=False, dropna=False).ngroup().to_numpy()
+    )
+    vm_pool, adv_pool = pool_codes[:len(vms)], pool_codes[len(vms):]
+    stride = len(vms) + int(adv["quantity"].sum()) + 1  # exceeds every slot and slot_end
+    adv_codes = adv_pool * stride + adv["slot_end"].to_numpy()
+    adv_by_code = np.argsort(adv_codes, kind="stable")
+    position = np.searchsorted(adv_codes[adv_by_code], vm_pool * stride + vms["slot"].to_numpy(), side="right")
+    # The first range ending after a slot starts at or before it, so only the pool must match
+    claimed = np.flatnonzero(position < len(adv))
+    owner = adv_by_code[position[claimed]]
+    same_pool = adv_pool[owner] == vm_pool[claimed]
+    claimed, owner = claimed[same_pool], owner[same_pool]
+
+    matched = pd.concat(
+        [
+            adv.iloc[owner].reset_index(drop=True),
+            vms.iloc[claimed].drop(columns=pool_columns).reset_index(drop=True),
+        ],
+        axis=1,
+    )
+    matched = matched.sort_values(["advisor_order", "slot"], kind="stable")
+
+    recommendations = [
+        {
+            "Subscription": rec["Name"],
+            "Recommendations": [
                 {
-                    "Subscription": adv["Name"],
-                    "Recommendations": [
-                        {
-                            "VM Name": vm["VM Name"],
-                            "VM Size": vm["VM Size"],
-                            "SKU": adv["SKU"],
-                            "Recommendation": adv["Description"],
-                            "Annual Savings": annual_savings,
-                            "Impact": adv["Impact"],
-                            "Region": adv["Savings Region"],
-                            "OS": vm["OS"],
-                            "OS Name": vm["OS Name"],
-                            "Tags": vm["Tags"],
-                            "Term": term,
-                            "Creation Time": vm["Creation Time"],
-                        }
-                    ],
+                    "VM Name": rec["VM Name"],
+                    "VM Size": rec["VM Size"],
+                    "SKU": rec["SKU"],
+                    "Recommendation": rec["Description"],
+                    "Annual Savings": float(rec["Annual Savings"]),
+                    "Impact": rec["Impact"],
+                    "Region": rec["Savings Region"],
+                    "OS": rec["OS"],
+                    "OS Name": rec["OS Name"],
+                    "Tags": rec["Tags"],
+                    "Term": rec["term"],
+                    "Creation Time": rec["Creation Time"],
                 }
-            )
-            seen_vms.add(vm["VM Name"])
-            selected += 1
-            if selected >= quantity:
-                break
+            ],
+        }
+        for rec in matched.to_dict("records")
+    ]
 
     # === Sort Recommendations by Annual Savings (High → Low) ===
     recommendations.sort(
@@ -295,16 +357,18 @@ def generate_vm_recommendations():
         rec for rec in recommendations if rec["Recommendations"][0]["Annual Savings"] >= savings_threshold
     ]
 
-    # If less than 20 high-impact recommendations, add more from the lower range (>= $1)
+    # If less than 20 high-impact recommendations, add more from the lower range (>= $1).
+    # Blank (NaN) savings leave the sort order undefined, so the high-impact ones are not
+    # necessarily a prefix; skip them by identity instead.
     if len(impact_recs) < 20:
+        taken = {id(rec) for rec in impact_recs}
         impact_recs += [
-            rec for rec in recommendations if rec["Recommendations"][0]["Annual Savings"] > 1
-            and rec not in impact_recs
+            rec for rec in recommendations
+            if rec["Recommendations"][0]["Annual Savings"] > 1 and id(rec) not in taken
         ][: 20 - len(impact_recs)]
 
     # === Save output.json (high-impact recommendations only) ===
-    with open("output.json", "w") as f:
-        json.dump(impact_recs, f, indent=4)
+    write_json(impact_recs, "output.json")
 
     # === Summary ===
     unique_skus = set([rec["Recommendations"][0]["SKU"] for rec in recommendations])
@@ -372,8 +436,7 @@ def generate_vm_recommendations():
         for rec in impact_recs
     ]
 
-    with open("inputs.json", "w") as f:
-        json.dump(input_json, f, indent=4)
+    write_json(input_json, "inputs.json")
     
     print(f"\n✅ Created output.json with {len(impact_recs)} recommendations")
     print(f"✅ Created inputs.json with {len(input_json)} entries")
@@ -383,18 +446,66 @@ def generate_vm_recommendations():
 # SECTION 2: PRICING ANALYSIS AND SPREADSHEET GENERATION
 ###############################################################################
 
-def get_prices(sku, region):
+# Shared HTTP session so concurrent Retail Prices API calls reuse pooled keep-alive connections
+PRICE_FETCH_WORKERS = 16
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared pooled HTTP session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+    return _session
+
+
+# On-disk cache of Retail Prices API results, keyed by "<sku>|<region>"
+PRICE_CACHE_FILE = "price_cache.json"
+PRICE_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def load_price_cache(path=PRICE_CACHE_FILE, ttl=PRICE_CACHE_TTL_SECONDS):
+    """Load cached pricing results from a previous run, dropping entries older than the TTL"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        cached = read_json(path)
+    except (OSError, json.decoder.JSONDecodeError) as e:
+        print(f"⚠️ Ignoring unreadable price cache {path}: {e}")
+        return {}
+    now = time.time()
+    return {
+        key: entry for key, entry in cached.items()
+        if now - entry.get("fetched_at", 0) < ttl
+    }
+
+
+def save_price_cache(price_cache, path=PRICE_CACHE_FILE):
+    """Persist pricing results so later runs can skip the API round trips"""
+    write_json(price_cache, path, indent=False)
+
+
+def get_prices(sku, region, session=None):
     """Fetch prices from Azure Retail Prices API for a given SKU and region"""
+    import orjson
+
+    session = session or get_session()
     base_url = "https://prices.azure.com/api/retail/prices"
     filter_str = f"$filter=serviceName eq 'Virtual Machines' and armSkuName eq '{sku}' and armRegionName eq '{region}'"
     url = f"{base_url}?{filter_str}"
 
     all_items = []
     while url:
-        r = requests.get(url)
+        r = session.get(url)
         try:
-            data = r.json()
-        except json.decoder.JSONDecodeError:
+            data = orjson.loads(r.content)
+        except orjson.JSONDecodeError:
             print(f"⚠️ Failed to decode JSON from {url}")
             break
         all_items.extend(data.get('Items', []))
@@ -504,71 +615,76 @@ def sanitize_sku_for_vantage(sku):
     return sanitized
 
 
-def build_azure_pricing(inputs):
-    """Build Azure pricing data from API - runs in parallel thread"""
-    estimate_rows = []
-    price_cache = {}
-    unique_skus_regions = set()
-    failover_driver = None  # Lazy initialization for failover scraping
+# Columns of the compute estimate, in output order
+ESTIMATE_COLUMNS = [
+    "Service category", "Service type", "VM Name", "Creation Time", "Tags", "Region",
+    "OS", "OS Name", "SKU", "Description", "Estimated monthly cost",
+]
 
-    for row in inputs:
-        region = row["Region"]
-        sku = row["SKU"]
-        os_type = row.get("OS", "")
-        os_name = row.get("OS Name", "")
-        hostname = row.get("VM Name", "")
-        tags = row.get("Tags", "")
-        creation_time = row.get("Creation Time", "")
 
-        # Track unique SKU-region pairs for Windows
-        if os_type.lower() == "windows":
-            sanitized_sku = sku.replace("Standard_", "").lower().replace("_", "-")
-            sanitized_sku_region = f"{sanitized_sku}_{region.lower()}"
-            unique_skus_regions.add(sanitized_sku_region)
-        else:
-            sanitized_sku = sku.lower().replace("_", "-")
-            sanitized_sku_region = f"{sanitized_sku}_{region.lower()}"
+def build_azure_pricing(inputs, executor=None):
+    """Build Azure pricing data from API, fetching on `executor` (or a private pool) if given"""
+    # Estimate rows are accumulated column-wise so the DataFrame is built without a row->column transpose
+    estimate_columns = {column: [] for column in ESTIMATE_COLUMNS}
+    price_cache = load_price_cache()
+    unique_skus_regions = set()
+    failover_driver = None  # Lazy initialization for failover scraping
 
+    def get_failover_driver():
+        nonlocal failover_driver
+        if failover_driver is None:
+            failover_driver = create_chrome_driver()
+            print(f"   Initialized failover WebDriver")
+        return failover_driver
+
+    # Fetch each distinct uncached SKU-region pair once, concurrently over the shared session
+    sku_region_pairs = list(dict.fromkeys((row["SKU"], row["Region"]) for row in inputs))
+    pairs_to_fetch = [(sku, region) for sku, region in sku_region_pairs if f"{sku}|{region}" not in price_cache]
+    print(f"Fetching Azure prices for {len(pairs_to_fetch)} of {len(sku_region_pairs)} unique SKU-region pairs "
+          f"({len(sku_region_pairs) - len(pairs_to_fetch)} cached)...")
+    with nullcontext(executor) if executor else ThreadPoolExecutor(max_workers=PRICE_FETCH_WORKERS) as pool:
+        fetched_prices = dict(zip(pairs_to_fetch, pool.map(lambda pair: get_prices(*pair), pairs_to_fetch)))
+
+    # Persist only non-empty API results. vantage.sh failover prices are compute-only and
+    # OS-specific, so they stay in memory for this run (price_lines below is keyed by OS)
+    # and the API is retried for those pairs next time.
+    fetched_at = time.time()
+    for (sku, region), prices in fetched_prices.items():
+        if prices:
+            price_cache[f"{sku}|{region}"] = {"fetched_at": fetched_at, "prices": prices}
+
+    def build_price_lines(sku, region, os_type):
+        """Resolve the (Description, monthly cost) lines for one SKU/region/OS, or None to skip it"""
         print(f"\n🔍 Fetching {sku} in {region} ({os_type})")
         if os_type.lower() == "unknown":
             print(f"   ⚠️ OS Type is Unknown - will fetch compute-only pricing (Linux base pricing)")
 
-        cache_key = (sku, region)
+        cache_key = f"{sku}|{region}"
         if cache_key in price_cache:
-            prices = price_cache[cache_key]
+            prices = price_cache[cache_key]["prices"]
         else:
-            prices = get_prices(sku, region)
-            
             # FAILOVER: If Azure API returns no data, try vantage.sh
-            if not prices:
-                print(f"⚠️ No pricing data from Azure API for {sku} in {region}")
-                print(f"🔄 Attempting failover to vantage.sh (compute-only pricing)...")
+            print(f"⚠️ No pricing data from Azure API for {sku} in {region}")
+            print(f"🔄 Attempting failover to vantage.sh (compute-only pricing)...")
+            
+            try:
+                prices = scrape_single_vm_pricing_compute_only(sku, region, os_type, get_failover_driver)
                 
-                try:
-                    # Lazy initialize failover driver on first use
-                    if failover_driver is None:
-                        chrome_options = Options()
-                        chrome_options.add_argument("--headless")
-                        failover_driver = webdriver.Chrome(options=chrome_options)
-                        print(f"   Initialized failover WebDriver")
-                    
-                    prices = scrape_single_vm_pricing_compute_only(sku, region, os_type, failover_driver)
+                if prices:
+                    print(f"✅ Successfully retrieved compute-only pricing from vantage.sh")
+                else:
+                    print(f"⚠️ No pricing found on vantage.sh either, skipping {sku}")
+                    return None
                     
-                    if prices:
-                        print(f"✅ Successfully retrieved compute-only pricing from vantage.sh")
-                    else:
-                        print(f"⚠️ No pricing found on vantage.sh either, skipping {sku}")
-                        continue
-                        
-                except Exception as e:
-                    print(f"❌ Vantage.sh failover failed: {e}")
-                    continue
-            
-            price_cache[cache_key] = prices
+            except Exception as e:
+                print(f"❌ Vantage.sh failover failed: {e}")
+                return None
 
         if not prices:
             print(f"⚠️ No pricing data available for {sku} in {region}")
-            continue
+            return None
+
+        lines = []
 
         # === PAYG ===
         payg = [p for p in prices if p.get("type") == "Consumption" and matches_os(p, os_type)]
@@ -580,19 +696,7 @@ def build_azure_pricing(inputs):
             meter_name = p.get("meterName", "")
             price = p.get("unitPrice", 0)
             monthly_cost = round(price * 730, 2)
-            estimate_rows.append({
-                "Service category": "Compute",
-                "Service type": "Virtual Machines",
-                "VM Name": hostname,
-                "Creation Time": creation_time,
-                "Tags": tags,
-                "Region": region,
-                "OS": os_type,
-                "OS Name": os_name,
-                "SKU": sanitized_sku,
-                "Description": f"1 {meter_name} ({sku}), {os_type}, Pay-as-you-go",
-                "Estimated monthly cost": f"${monthly_cost:,.2f}"
-            })
+            lines.append((f"1 {meter_name} ({sku}), {os_type}, Pay-as-you-go", f"${monthly_cost:,.2f}"))
 
         # === Reservations ===
         if os_type.lower() == "windows":
@@ -620,20 +724,51 @@ def build_azure_pricing(inputs):
             total_price = p.get("unitPrice", 0)
             months = 12 if "1" in term else 36
             monthly_cost = round(total_price / months, 2)
+            lines.append((f"1 {meter_name} ({sku}) ({term}), {os_type} Reservation", f"${monthly_cost:,.2f}"))
+
+        return lines
+
+    # Price each distinct SKU/region/OS once; the per-VM loop below only emits rows
+    price_lines = {}
+    for row in inputs:
+        key = (row["SKU"], row["Region"], row.get("OS", ""))
+        if key not in price_lines:
+            price_lines[key] = build_price_lines(*key)
+    print(f"\nPriced {len(price_lines)} unique SKU/region/OS combinations for {len(inputs)} VMs")
+
+    for row in inputs:
+        region = row["Region"]
+        sku = row["SKU"]
+        os_type = row.get("OS", "")
 
-            estimate_rows.append({
-                "Service category": "Compute",
-                "Service type": "Virtual Machines",
-                "VM Name": hostname,
-                "Creation Time": creation_time,
-                "Tags": tags,
-                "Region": region,
-                "OS": os_type,
-                "OS Name": os_name,
-                "SKU": sanitized_sku,
-                "Description": f"1 {meter_name} ({sku}) ({term}), {os_type} Reservation",
-                "Estimated monthly cost": f"${monthly_cost:,.2f}"
-            })
+        # Track unique SKU-region pairs for Windows
+        if os_type.lower() == "windows":
+            sanitized_sku = sku.replace("Standard_", "").lower().replace("_", "-")
+            unique_skus_regions.add(f"{sanitized_sku}_{region.lower()}")
+        else:
+            sanitized_sku = sku.lower().replace("_", "-")
+
+        lines = price_lines[(sku, region, os_type)]
+        if not lines:
+            continue
+
+        row_fields = {
+            "Service category": "Compute",
+            "Service type": "Virtual Machines",
+            "VM Name": row.get("VM Name", ""),
+            "Creation Time": row.get("Creation Time", ""),
+            "Tags": row.get("Tags", ""),
+            "Region": region,
+            "OS": os_type,
+            "OS Name": row.get("OS Name", ""),
+            "SKU": sanitized_sku,
+        }
+        for column, value in row_fields.items():
+            estimate_columns[column].extend([value] * len(lines))
+        estimate_columns["Description"].extend(description for description, _ in lines)
+        estimate_columns["Estimated monthly cost"].extend(monthly_cost for _, monthly_cost in lines)
+
+    save_price_cache(price_cache)
 
     # Cleanup failover driver if it was created
     if failover_driver is not None:
@@ -643,42 +778,130 @@ def build_azure_pricing(inputs):
         except:
             pass
 
-    return estimate_rows, unique_skus_regions
+    return estimate_columns, unique_skus_regions
+
+
+# Number of concurrent vantage.sh workers (each starts its own headless Chrome on first use)
+VANTAGE_SCRAPE_WORKERS = 6
+# Pricing cards must read the same twice this many seconds apart before they are used
+VANTAGE_SETTLE_SECONDS = 0.5
+
+
+# On-disk cache of scraped Windows prices, keyed by "<sku>_<region>" (same format and
+# TTL as the Retail Prices cache)
+WINDOWS_PRICE_CACHE_FILE = "windows_price_cache.json"
+
+# Collects [price text, card description] for every pricing card in one browser round trip
+VANTAGE_EXTRACT_SCRIPT = """
+const section = document.querySelector("section.mb-4");
+if (!section) return [];
+return Array.from(section.querySelectorAll("p.font-bold"), (p) => [
+    p.innerText.trim().replace(/\\n/g, " ").split(" ")[0],
+    p.parentElement.innerText.trim().replace(/\\n/g, " "),
+]);
+"""
 
 
-def scrape_windows_pricing(unique_skus_regions):
-    """Scrape Windows pricing from vantage.sh - runs in parallel thread"""
+def create_chrome_driver():
+    """Start a headless Chrome for rendering vantage.sh pages"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     chrome_options = Options()
     chrome_options.add_argument("--headless")
-    driver = webdriver.Chrome(options=chrome_options)
+    return webdriver.Chrome(options=chrome_options)
 
-    azure_windows_pricing_data = {}
-    sku_region_pairs = list(unique_skus_regions)
+
+def wait_for_vantage_pricing(driver, timeout=5):
+    """
+    Block until the vantage.sh pricing cards have rendered and stopped changing, then
+    return them as {price text: description} (instead of a fixed sleep).
+
+    The page is server-rendered with default prices that client-side JS then replaces
+    with those for the region, platform and pricingType in the URL, so the cards only
+    count once two reads VANTAGE_SETTLE_SECONDS apart agree.
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    last_read = {}
+
+    def settled_pricing(driver):
+        pricing_data = dict(driver.execute_script(VANTAGE_EXTRACT_SCRIPT))
+        if pricing_data and pricing_data == last_read.get("pricing"):
+            return pricing_data
+        last_read["pricing"] = pricing_data
+        return False
+
+    return WebDriverWait(driver, timeout, poll_frequency=VANTAGE_SETTLE_SECONDS).until(settled_pricing)
+
+
+def scrape_vantage_pricing(url, get_driver):
+    """
+    Extract {price text: description} from a vantage.sh instance page.
+    
+    Renders the page with Selenium; get_driver() returns the WebDriver to use.
+    """
+    driver = get_driver()
+    driver.get(url)
+
+    # Read all the cards in the page itself rather than one WebDriver call per element
+    return wait_for_vantage_pricing(driver)
+
+
+def scrape_windows_pricing(unique_skus_regions, executor=None):
+    """Scrape Windows pricing from vantage.sh, running workers on `executor` (or a private pool) if given"""
+    if not unique_skus_regions:
+        return {}
+
+    # Reuse prices scraped by a recent run and only visit pages for the rest
+    windows_cache = load_price_cache(WINDOWS_PRICE_CACHE_FILE)
+    sku_region_pairs = [sku_region for sku_region in unique_skus_regions if sku_region not in windows_cache]
     total_pairs = len(sku_region_pairs)
+    print(f"Scraping vantage.sh for {total_pairs} of {len(unique_skus_regions)} Windows SKU-region pairs "
+          f"({len(unique_skus_regions) - total_pairs} cached)...")
+    cached_pricing = {
+        sku_region: windows_cache[sku_region]["prices"]
+        for sku_region in unique_skus_regions if sku_region in windows_cache
+    }
+    if not sku_region_pairs:
+        return cached_pricing
 
-    for idx, sku_region in enumerate(sku_region_pairs, start=1):
-        sku, region = sku_region.split('_')
-        print(f"Processing {idx}/{total_pairs}: SKU = {sku}, Region = {region}...")
+    def scrape_chunk(chunk):
+        """Scrape a share of the SKU-region pairs with one WebDriver, started on the first page"""
+        driver = None
+        chunk_pricing = {}
 
-        url = f"https://instances.vantage.sh/azure/vm/{sku}?currency=USD&platform=windows&duration=monthly&pricingType=Standard.allUpfront&region={region}"
-        driver.get(url)
-        time.sleep(1)
+        def get_driver():
+            nonlocal driver
+            if driver is None:
+                driver = create_chrome_driver()
+            return driver
 
         try:
-            section = driver.find_element(By.CSS_SELECTOR, "section.mb-4")
-            pricing_elements = section.find_elements(By.CSS_SELECTOR, "p.font-bold")
-            pricing_data = {}
+            for idx, sku_region in chunk:
+                sku, region = sku_region.split('_')
+                print(f"Processing {idx}/{total_pairs}: SKU = {sku}, Region = {region}...")
 
-            for element in pricing_elements:
-                pricing_text = element.text.strip().replace("\n", " ").split(" ")[0]
-                pricing_data[pricing_text] = element.find_element(By.XPATH, "..").text.strip()
+                url = f"https://instances.vantage.sh/azure/vm/{sku}?currency=USD&platform=windows&duration=monthly&pricingType=Standard.allUpfront&region={region}"
+                try:
+                    chunk_pricing[sku_region] = scrape_vantage_pricing(url, get_driver)
+                except Exception as e:
+                    print(f"⚠️ Error processing {sku_region}: {e}")
+        finally:
+            if driver is not None:
+                driver.quit()
 
-            azure_windows_pricing_data[sku_region] = pricing_data
+        return chunk_pricing
 
-        except Exception as e:
-            print(f"⚠️ Error processing {sku_region}: {e}")
+    # Deal the pairs round-robin across the workers
+    worker_count = min(VANTAGE_SCRAPE_WORKERS, total_pairs)
+    numbered_pairs = list(enumerate(sku_region_pairs, start=1))
+    chunks = [numbered_pairs[i::worker_count] for i in range(worker_count)]
 
-    driver.quit()
+    azure_windows_pricing_data = {}
+    with nullcontext(executor) if executor else ThreadPoolExecutor(max_workers=worker_count) as pool:
+        for chunk_pricing in pool.map(scrape_chunk, chunks):
+            azure_windows_pricing_data.update(chunk_pricing)
 
     # Clean and filter the pricing data
     filtered_pricing = {}
@@ -694,10 +917,18 @@ def scrape_windows_pricing(unique_skus_regions):
                 filtered_prices["3-Year Reserved"] = price
         filtered_pricing[sku_region] = filtered_prices
 
-    return filtered_pricing
+    # Only cache pages that yielded prices, so failed scrapes are retried next run
+    fetched_at = time.time()
+    windows_cache.update(
+        (sku_region, {"fetched_at": fetched_at, "prices": prices})
+        for sku_region, prices in filtered_pricing.items() if prices
+    )
+    save_price_cache(windows_cache, WINDOWS_PRICE_CACHE_FILE)
+
+    return {**cached_pricing, **filtered_pricing}
 
 
-def scrape_single_vm_pricing_compute_only(sku, region, os_type, driver):
+def scrape_single_vm_pricing_compute_only(sku, region, os_type, get_driver):
     """
     Scrape compute-only pricing for a single VM from vantage.sh (failover for Azure API)
     
@@ -705,7 +936,7 @@ def scrape_single_vm_pricing_compute_only(sku, region, os_type, driver):
         sku: Azure SKU (e.g., 'Standard_F4s_v2')
         region: Azure region (e.g., 'westeurope')
         os_type: OS type ('Windows' or 'Linux')
-        driver: Selenium WebDriver instance
+        get_driver: Callable returning the Selenium WebDriver to render the page with
         
     Returns:
         List of pricing items formatted like Azure API response, or empty list if failed
@@ -733,22 +964,7 @@ def scrape_single_vm_pricing_compute_only(sku, region, os_type, driver):
         url = f"https://instances.vantage.sh/azure/vm/{vantage_sku}?currency=USD&platform={os_platform}&duration=monthly&pricingType={pricing_type}&region={vantage_region}"
         
         print(f"   Vantage URL: {url}")
-        driver.get(url)
-        time.sleep(1.5)  # Wait for page load
-        
-        # Find pricing section
-        section = driver.find_element(By.CSS_SELECTOR, "section.mb-4")
-        pricing_elements = section.find_elements(By.CSS_SELECTOR, "p.font-bold")
-        
-        # Extract pricing data
-        pricing_data = {}
-        for element in pricing_elements:
-            try:
-                price_text = element.text.strip().replace("\n", " ").split(" ")[0]
-                full_description = element.find_element(By.XPATH, "..").text.strip().replace("\n", " ")
-                pricing_data[price_text] = full_description
-            except:
-                continue
+        pricing_data = scrape_vantage_pricing(url, get_driver)
         
         if not pricing_data:
             print(f"   No pricing elements found on vantage.sh page")
@@ -807,10 +1023,44 @@ def scrape_single_vm_pricing_compute_only(sku, region, os_type, driver):
         return []
 
 
-def build_final_dataframes(estimate_rows, windows_pricing_data):
+def parse_cost_column(costs):
+    """Convert '$1,234.56' cost strings to floats (NaN where blank or unparseable)"""
+    import pandas as pd
+
+    cleaned = costs.astype(str).str.replace(r'[$,]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def classify_cost_rows(descriptions):
+    """Label each row 'total', 'payg', '1yr', '3yr' or 'other' from its Description in one pass"""
+    import numpy as np
+
+    desc = descriptions.fillna('').astype(str).str.lower()
+    return np.select(
+        [
+            desc.str.contains('total', regex=False),
+            desc.str.contains('pay-as-you-go', regex=False),
+            desc.str.contains('1 year', regex=False),
+            desc.str.contains('3 years', regex=False),
+        ],
+        ['total', 'payg', '1yr', '3yr'],
+        default='other',
+    )
+
+
+def compute_totals(df, kind_col, cost_col):
+    """Sum `cost_col` per cost category, returning the 'payg', '1yr' and '3yr' totals"""
+    sums = df.groupby(kind_col)[cost_col].sum()
+    return {kind: sums.get(kind, 0) for kind in ('payg', '1yr', '3yr')}
+
+
+def build_final_dataframes(estimate_columns, windows_pricing_data):
     """Build final sorted and formatted DataFrames"""
+    import numpy as np
+    import pandas as pd
+
     # Validate input data
-    if not estimate_rows:
+    if not any(estimate_columns.values()):
         raise ValueError(
             "No pricing data was retrieved. This could happen if:\n"
             "  1. No VMs matched the Advisor recommendations\n"
@@ -820,7 +1070,7 @@ def build_final_dataframes(estimate_rows, windows_pricing_data):
         )
     
     # Create initial DataFrame
-    df = pd.DataFrame(estimate_rows)
+    df = pd.DataFrame(estimate_columns)
     
     # Validate DataFrame has required columns
     required_columns = ['VM Name', 'Description', 'Estimated monthly cost']
@@ -832,227 +1082,313 @@ def build_final_dataframes(estimate_rows, windows_pricing_data):
             "This indicates a problem with the pricing data structure."
         )
     
-    # Extract pricing for sorting
-    vm_pricing = {}
-    for _, row in df.iterrows():
-        if pd.notna(row['VM Name']) and 'Pay-as-you-go' in str(row.get('Description', '')):
-            cost_str = str(row['Estimated monthly cost']).replace('$', '').replace(',', '')
-            try:
-                vm_pricing[row['VM Name']] = float(cost_str)
-            except:
-                vm_pricing[row['VM Name']] = 0
-    
-    # Sort VMs by pay-as-you-go cost
-    sorted_vms = sorted(vm_pricing.items(), key=lambda x: x[1], reverse=True)
-    sorted_vm_names = [vm[0] for vm in sorted_vms]
-    
-    # Rebuild dataframe in sorted order with blank rows
-    sorted_rows = []
-    for vm_name in sorted_vm_names:
-        vm_rows = df[df['VM Name'] == vm_name]
-        for _, row in vm_rows.iterrows():
-            sorted_rows.append(row.to_dict())
-        # Add blank row
-        sorted_rows.append({col: '' for col in df.columns})
-    
-    # Calculate totals
-    df_sorted = pd.DataFrame(sorted_rows)
-    df_sorted['Estimated monthly cost'] = df_sorted['Estimated monthly cost'].replace('', None)
-    
-    # Extract numeric values for totals
-    df_sorted['cost_numeric'] = df_sorted.apply(lambda row: 
-        float(str(row['Estimated monthly cost']).replace('$', '').replace(',', '')) 
-        if pd.notna(row['Estimated monthly cost']) and row['Estimated monthly cost'] != '' 
-        else 0, axis=1)
+    # Extract pricing for sorting (last Pay-as-you-go row per VM wins)
+    df['cost_numeric'] = parse_cost_column(df['Estimated monthly cost'])
+    df['_kind'] = classify_cost_rows(df['Description'])
+    payg_rows = df[df['VM Name'].notna() & (df['_kind'] == 'payg')]
+    vm_pricing = payg_rows.groupby('VM Name', sort=False)['cost_numeric'].last().fillna(0)
     
-    total_payg = df_sorted[df_sorted['Description'].str.contains('Pay-as-you-go', case=False, na=False)]['cost_numeric'].sum()
-    total_1yr = df_sorted[df_sorted['Description'].str.contains('1 Year', case=False, na=False)]['cost_numeric'].sum()
-    total_3yr = df_sorted[df_sorted['Description'].str.contains('3 Years', case=False, na=False)]['cost_numeric'].sum()
+    # Sort VMs by pay-as-you-go cost (high to low). A stable argsort of the negated
+    # costs keeps tied VMs in first-seen order, like sort_values(ascending=False)
+    vm_pricing = vm_pricing.iloc[np.argsort(-vm_pricing.to_numpy(), kind='stable')]
+    sorted_vm_names = vm_pricing.index.tolist()
     
-    # Add totals rows
-    totals_rows = [
-        {'Service category': 'Total', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': 'Total Monthly Pay-as-you-go', 
-         'Estimated monthly cost': f'${total_payg:,.2f}'},
-        {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': 'Total 1 Year Reservations (Billed monthly)', 
-         'Estimated monthly cost': f'${total_1yr:,.2f}'},
-        {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': 'Total 3 Year Reservations (Billed monthly)', 
-         'Estimated monthly cost': f'${total_3yr:,.2f}'},
-    ]
-    
-    df_sorted = df_sorted.drop('cost_numeric', axis=1)
-    df_final = pd.concat([df_sorted, pd.DataFrame(totals_rows)], ignore_index=True)
+    # Rebuild dataframe in sorted order with a blank row after each VM
+    vm_rank = pd.Series(np.arange(len(sorted_vm_names)), index=sorted_vm_names)
+    body = df[df['VM Name'].isin(vm_rank.index)]
+    body = body.assign(_order=body['VM Name'].map(vm_rank).to_numpy() * 2)
+    blanks = pd.DataFrame('', index=range(len(vm_rank)), columns=df.columns)
+    blanks['Estimated monthly cost'] = None
+    blanks['cost_numeric'] = 0.0
+    blanks['_kind'] = 'other'
+    blanks['_order'] = vm_rank.to_numpy() * 2 + 1
+    df_sorted = (
+        pd.concat([body, blanks], ignore_index=True)
+        .sort_values('_order', kind='stable')
+        .drop(columns='_order')
+        .reset_index(drop=True)
+    )
+    df_sorted['cost_numeric'] = df_sorted['cost_numeric'].fillna(0)
     
-    # Build azure_savings_estimate with Windows pricing updates
-    df_savings = df_final.copy()
+    # Apply vantage.sh Windows prices to the cost column only; both tables share df_sorted.
+    # Look up prices by "<sku>_<region>|<kind>" for every Windows row at once
+    price_labels = {'payg': 'On Demand', '1yr': '1-Year Reserved', '3yr': '3-Year Reserved'}
+    windows_lookup = {
+        f"{sku_region}|{kind}": pricing_info[label]
+        for sku_region, pricing_info in windows_pricing_data.items()
+        for kind, label in price_labels.items()
+        if pricing_info.get(label) is not None
+    }
+    windows_rows = df_sorted[df_sorted['OS'].astype(str).str.lower().eq('windows')]
+    lookup_keys = (
+        windows_rows['SKU'].astype(str).str.lower() + '_'
+        + windows_rows['Region'].astype(str).str.lower() + '|'
+        + windows_rows['_kind']
+    )
+    # Parse and round to 2 decimal places
+    windows_costs = parse_cost_column(lookup_keys.map(windows_lookup)).dropna()
+    savings_costs = df_sorted['Estimated monthly cost'].copy()
+    savings_costs.loc[windows_costs.index] = windows_costs.map('${:,.2f}'.format)
     
-    for idx, row in df_savings.iterrows():
-        sku = str(row['SKU']).lower() if pd.notna(row['SKU']) else ''
-        region = str(row['Region']).lower() if pd.notna(row['Region']) else ''
-        os = str(row['OS']).lower() if pd.notna(row['OS']) else ''
-        
-        if not sku or not region or not os or os != 'windows':
-            continue
-        
-        sku_region = f"{sku}_{region}"
-        
-        if sku_region in windows_pricing_data:
-            pricing_info = windows_pricing_data[sku_region]
-            description = str(row['Description']) if pd.notna(row['Description']) else ''
-            
-            if 'On Demand' in description or 'Pay-as-you-go' in description:
-                cost = pricing_info.get('On Demand', None)
-                if cost is not None:
-                    # Parse and round to 2 decimal places
-                    cost_value = float(str(cost).replace('$', '').replace(',', ''))
-                    df_savings.at[idx, 'Estimated monthly cost'] = f"${cost_value:,.2f}"
-            elif '1 Year' in description:
-                cost = pricing_info.get('1-Year Reserved', None)
-                if cost is not None:
-                    # Parse and round to 2 decimal places
-                    cost_value = float(str(cost).replace('$', '').replace(',', ''))
-                    df_savings.at[idx, 'Estimated monthly cost'] = f"${cost_value:,.2f}"
-            elif '3 Years' in description:
-                cost = pricing_info.get('3-Year Reserved', None)
-                if cost is not None:
-                    # Parse and round to 2 decimal places
-                    cost_value = float(str(cost).replace('$', '').replace(',', ''))
-                    df_savings.at[idx, 'Estimated monthly cost'] = f"${cost_value:,.2f}"
+    # Calculate totals for both tables with a single groupby each
+    totals = compute_totals(df_sorted, '_kind', 'cost_numeric')
+    savings_totals = compute_totals(
+        df_sorted.assign(cost_numeric=parse_cost_column(savings_costs).fillna(0)), '_kind', 'cost_numeric'
+    )
     
-    # Recalculate totals for savings estimate
-    df_savings['cost_numeric'] = df_savings.apply(lambda row: 
-        float(str(row['Estimated monthly cost']).replace('$', '').replace(',', '')) 
-        if pd.notna(row['Estimated monthly cost']) and row['Estimated monthly cost'] != '' and 'Total' not in str(row.get('Service category', ''))
-        else 0, axis=1)
+    def summary_row(description, cost, category=''):
+        return {'Service category': category, 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '',
+                'OS': '', 'OS Name': '', 'SKU': '', 'Description': description, 'Estimated monthly cost': cost}
     
-    total_payg_savings = df_savings[df_savings['Description'].str.contains('Pay-as-you-go', case=False, na=False)]['cost_numeric'].sum()
-    total_1yr_savings = df_savings[df_savings['Description'].str.contains('1 Year', case=False, na=False) & ~df_savings['Description'].str.contains('Total', case=False, na=False)]['cost_numeric'].sum()
-    total_3yr_savings = df_savings[df_savings['Description'].str.contains('3 Years', case=False, na=False) & ~df_savings['Description'].str.contains('Total', case=False, na=False)]['cost_numeric'].sum()
+    def totals_rows(sums):
+        return [
+            summary_row('Total Monthly Pay-as-you-go', f"${sums['payg']:,.2f}", category='Total'),
+            summary_row('Total 1 Year Reservations (Billed monthly)', f"${sums['1yr']:,.2f}"),
+            summary_row('Total 3 Year Reservations (Billed monthly)', f"${sums['3yr']:,.2f}"),
+        ]
     
-    # Update totals in savings dataframe
-    annual_payg = total_payg_savings * 12
-    annual_1yr = total_1yr_savings * 12
-    annual_3yr = total_3yr_savings * 12
+    # Yearly and 3-year projections for the savings estimate
+    annual_payg = savings_totals['payg'] * 12
+    annual_1yr = savings_totals['1yr'] * 12
+    annual_3yr = savings_totals['3yr'] * 12
     savings_1yr = annual_payg - annual_1yr
     savings_3yr = annual_payg - annual_3yr
-    total_36_months = total_payg_savings * 36
-    total_3yr_cost = total_3yr_savings * 36
-    
-    # Update existing total rows and add savings rows
-    mask_payg = df_savings['Description'] == 'Total Monthly Pay-as-you-go'
-    mask_1yr = df_savings['Description'] == 'Total 1 Year Reservations (Billed monthly)'
-    mask_3yr = df_savings['Description'] == 'Total 3 Year Reservations (Billed monthly)'
-    
-    df_savings.loc[mask_payg, 'Estimated monthly cost'] = f'${total_payg_savings:,.2f}'
-    df_savings.loc[mask_1yr, 'Estimated monthly cost'] = f'${total_1yr_savings:,.2f}'
-    df_savings.loc[mask_3yr, 'Estimated monthly cost'] = f'${total_3yr_savings:,.2f}'
-    
-    # Add additional savings rows with blank row formatting (3 lines + blank)
-    blank_row = {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-                 'OS': '', 'OS Name': '', 'SKU': '', 'Description': '', 'Estimated monthly cost': ''}
+    total_36_months = savings_totals['payg'] * 36
+    total_3yr_cost = savings_totals['3yr'] * 36
     
+    # Savings rows with blank row formatting (3 lines + blank)
+    blank_row = summary_row('', '')
     additional_rows = [
         # Blank row after monthly totals
-        blank_row.copy(),
+        blank_row,
         # Yearly and 1-year savings
-        {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': 'Total Yearly Pay-as-you-go', 
-         'Estimated monthly cost': f'${annual_payg:,.2f}'},
-        {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': 'Total 1 Year Reservations (Annual cost)', 
-         'Estimated monthly cost': f'${annual_1yr:,.2f}'},
-        {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': 'Annual Savings (1 Year Reservations)', 
-         'Estimated monthly cost': f'${savings_1yr:,.2f}'},
+        summary_row('Total Yearly Pay-as-you-go', f'${annual_payg:,.2f}'),
+        summary_row('Total 1 Year Reservations (Annual cost)', f'${annual_1yr:,.2f}'),
+        summary_row('Annual Savings (1 Year Reservations)', f'${savings_1yr:,.2f}'),
         # Blank row
-        blank_row.copy(),
+        blank_row,
         # 3-year totals
-        {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': 'Total 36 Months Pay-as-you-go', 
-         'Estimated monthly cost': f'${total_36_months:,.2f}'},
-        {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': 'Total 3 Year Reservations (3 Year cost)', 
-         'Estimated monthly cost': f'${total_3yr_cost:,.2f}'},
-        {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': 'Total 3 Year Reservations (annual cost)', 
-         'Estimated monthly cost': f'${annual_3yr:,.2f}'},
+        summary_row('Total 36 Months Pay-as-you-go', f'${total_36_months:,.2f}'),
+        summary_row('Total 3 Year Reservations (3 Year cost)', f'${total_3yr_cost:,.2f}'),
+        summary_row('Total 3 Year Reservations (annual cost)', f'${annual_3yr:,.2f}'),
         # Blank row
-        blank_row.copy(),
+        blank_row,
         # Final savings row
-        {'Service category': '', 'Service type': '', 'VM Name': '', 'Tags': '', 'Region': '', 
-         'OS': '', 'OS Name': '', 'SKU': '', 'Description': '3 Year Reservations (Annual Savings)', 
-         'Estimated monthly cost': f'${savings_3yr:,.2f}'},
+        summary_row('3 Year Reservations (Annual Savings)', f'${savings_3yr:,.2f}'),
     ]
     
-    df_savings = df_savings.drop('cost_numeric', axis=1)
-    df_savings = pd.concat([df_savings, pd.DataFrame(additional_rows)], ignore_index=True)
+    # Drop the helper columns once, then build each output table with a single concat
+    df_body = df_sorted.drop(columns=['cost_numeric', '_kind'])
+    df_final = pd.concat([df_body, pd.DataFrame(totals_rows(totals))], ignore_index=True)
+    df_savings = pd.concat(
+        [
+            df_body.assign(**{'Estimated monthly cost': savings_costs}),
+            pd.DataFrame(totals_rows(savings_totals) + additional_rows),
+        ],
+        ignore_index=True,
+    )
     
     # Build ranked_vms (just VM name and pay-as-you-go cost)
-    ranked_data = []
-    for vm_name in sorted_vm_names:
-        ranked_data.append({
-            'VM Name': vm_name,
-            'Pay-as-you-go': f'${vm_pricing[vm_name]:,.2f}'
-        })
-    df_ranked = pd.DataFrame(ranked_data)
+    df_ranked = pd.DataFrame({
+        'VM Name': sorted_vm_names,
+        'Pay-as-you-go': [f'${cost:,.2f}' for cost in vm_pricing.to_numpy()],
+    })
     
     return df_final, df_savings, df_ranked
 
 
-def apply_excel_formatting(file_path):
-    """Apply bold headers and borders to Excel file, and bold specific savings rows"""
-    wb = load_workbook(file_path)
-    ws = wb.active
-    
-    border_style = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Bold and border the header row
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-        cell.border = border_style
-    
-    # Bold the two annual savings rows
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-        # Check the Description column (column I, index 8)
-        description_cell = row[8]
-        if description_cell.value in ['Annual Savings (1 Year Reservations)', '3 Year Reservations (Annual Savings)']:
-            # Bold the Description cell and the Estimated monthly cost cell (column J, index 9)
-            description_cell.font = Font(bold=True)
-            row[9].font = Font(bold=True)
-    
-    wb.save(file_path)
+# Rows of the savings sheet whose Description and cost cells are highlighted in bold
+HIGHLIGHTED_SAVINGS_ROWS = {'Annual Savings (1 Year Reservations)', '3 Year Reservations (Annual Savings)'}
+
+# Control characters that are not allowed in XML text
+XLSX_ILLEGAL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+# Minimal OOXML parts for write_xlsx_direct. Cell style 1 is the bold bordered
+# header and style 2 the bold highlight; everything else uses the default style 0.
+XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XLSX_STYLES = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<styleSheet xmlns="{XLSX_MAIN_NS}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+XLSX_HEADER_STYLE = 1
+XLSX_BOLD_STYLE = 2
+# Sheet XML is highly repetitive, so level 1 deflate already compresses it well at
+# a fraction of the default level's CPU cost
+XLSX_COMPRESSLEVEL = 1
+# Distinct (value, style) pairs whose rendered cell markup is kept by xlsx_cell_body
+XLSX_CELL_CACHE_SIZE = 65536
+
+
+def xlsx_column_letter(index):
+    """Convert a 0-based column index to its spreadsheet letters (0 -> A, 26 -> AA)"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+@functools.lru_cache(maxsize=XLSX_CELL_CACHE_SIZE, typed=True)
+def xlsx_cell_body(value, style=0):
+    """
+    Render a <c> element minus its opening '<c r="..."' (None for an unstyled empty cell).
+
+    Sheets repeat the same few values and styles down each column, so the escaped
+    markup is cached per (value, style); typed=True keeps True, 1 and 1.0 apart.
+    """
+    style_attr = f' s="{style}"' if style else ''
+    if value is None or value == "":
+        return f'{style_attr}/>' if style else None
+    if isinstance(value, bool):
+        return f'{style_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return f'{style_attr}><v>{value}</v></c>'
+    text = escape(XLSX_ILLEGAL_CHARS.sub("", str(value)))
+    return f'{style_attr} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
 
 
-def generate_pricing_spreadsheets():
-    """Generate pricing spreadsheets and analysis"""
-    print("\n" + "="*80)
-    print("SECTION 2: GENERATING PRICING SPREADSHEETS")
-    print("="*80 + "\n")
+def xlsx_cell(ref, value, style=0):
+    """Render one <c> element: numbers as values, anything else as an inline string"""
+    body = xlsx_cell_body(value, style)
+    return f'<c r="{ref}"{body}' if body else ''
+
+
+def write_xlsx_direct(path, sheets, compression=zipfile.ZIP_DEFLATED, compresslevel=XLSX_COMPRESSLEVEL):
+    """
+    Write an .xlsx file by streaming the sheet XML straight into the zip container.
+
+    Args:
+        path: Output .xlsx path
+        sheets: List of (sheet_name, df, highlight_rows) tuples. Rows whose Description
+            is in highlight_rows get bold Description and Estimated monthly cost cells.
+        compression: zipfile compression method (zipfile.ZIP_STORED skips deflate entirely)
+        compresslevel: Deflate level; low levels trade a little file size for much less CPU
+    """
+    sheet_parts = [f"xl/worksheets/sheet{n}.xml" for n in range(1, len(sheets) + 1)]
+    with zipfile.ZipFile(path, "w", compression, compresslevel=compresslevel) as zf:
+        zf.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + "".join(
+                f'<Override PartName="/{part}" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for part in sheet_parts
+            )
+            + '</Types>'
+        ))
+        zf.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{XLSX_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ))
+        zf.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{XLSX_MAIN_NS}" xmlns:r="{XLSX_REL_NS}"><sheets>'
+            + "".join(
+                f'<sheet name="{sheet_name}" sheetId="{n}" r:id="rId{n}"/>'
+                for n, (sheet_name, _, _) in enumerate(sheets, start=1)
+            )
+            + '</sheets></workbook>'
+        ))
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{n}" Type="{XLSX_REL_NS}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+                for n in range(1, len(sheets) + 1)
+            )
+            + f'<Relationship Id="rId{len(sheets) + 1}" Type="{XLSX_REL_NS}/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        ))
+        zf.writestr("xl/styles.xml", XLSX_STYLES)
+
+        for part, (sheet_name, df, highlight_rows) in zip(sheet_parts, sheets):
+            letters = [xlsx_column_letter(idx) for idx in range(len(df.columns))]
+            if highlight_rows:
+                highlight_idx = (df.columns.get_loc('Description'), df.columns.get_loc('Estimated monthly cost'))
+            # Blank out missing values for the whole frame at once (object dtype also
+            # turns NumPy scalars into plain Python ints/floats/bools)
+            values = df.astype(object).where(df.notna(), None)
+
+            with zf.open(part, "w") as f:
+                f.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                        f'<worksheet xmlns="{XLSX_MAIN_NS}"><sheetData>'.encode())
+                header = "".join(
+                    xlsx_cell(f"{letter}1", column, XLSX_HEADER_STYLE)
+                    for letter, column in zip(letters, df.columns)
+                )
+                f.write(f'<row r="1">{header}</row>'.encode())
+                for row_number, row in enumerate(values.itertuples(index=False, name=None), start=2):
+                    bold_idx = highlight_idx if highlight_rows and row[highlight_idx[0]] in highlight_rows else ()
+                    cells = "".join(
+                        xlsx_cell(f"{letter}{row_number}", value, XLSX_BOLD_STYLE if idx in bold_idx else 0)
+                        for idx, (letter, value) in enumerate(zip(letters, row))
+                    )
+                    f.write(f'<row r="{row_number}">{cells}</row>'.encode())
+                f.write(b'</sheetData></worksheet>')
+
+
+def write_savings_workbook(df_savings, df_savings_flat, file_path):
+    """
+    Write the savings sheets with write_xlsx_direct, applying the formatting
+    (bold bordered headers, bold annual savings rows) as cells are written
+    so the file never has to be re-opened.
+    """
+    write_xlsx_direct(file_path, [
+        ('Sheet1', df_savings, HIGHLIGHTED_SAVINGS_ROWS),
+        ('FilterMe', df_savings_flat, ()),
+    ])
+
+
+def generate_pricing_spreadsheets(debug=False, no_xlsx=False):
+    """
+    Generate pricing spreadsheets and analysis
+
+    Args:
+        debug: Pretty-print azure_windows_pricing_data.json
+        no_xlsx: Write the unformatted estimate and ranked tables as CSV instead of .xlsx
+    """
+    import numpy as np
+
+    print("\n" + "="*80 + "\nSECTION 2: GENERATING PRICING SPREADSHEETS\n" + "="*80 + "\n")
     
     # Load inputs
     INPUT_FILE = "inputs.json"
     if not os.path.exists(INPUT_FILE):
         raise FileNotFoundError(f"❌ Could not find {INPUT_FILE}")
 
-    with open(INPUT_FILE, "r") as f:
-        inputs = json.load(f)
+    inputs = read_json(INPUT_FILE)
 
     # Initialize Windows SKU-region tracking
     unique_skus_regions = set()
     
     # Save empty skus-regions-windows.json initially
-    with open("skus-regions-windows.json", "w") as f:
-        json.dump([], f, indent=4)
-    print(f"✅ Created empty skus-regions-windows.json")
+    write_json([], "skus-regions-windows.json")
 
-    print("\n=== Phase 1: Identifying Windows SKUs from inputs ===")
+    # Phase 1 is a quick in-memory pass, so its status lines are printed together
+    status_lines = ["✅ Created empty skus-regions-windows.json",
+                    "\n=== Phase 1: Identifying Windows SKUs from inputs ==="]
     # Quick pass to identify Windows SKUs for parallel scraping
     for row in inputs:
         if row.get("OS", "").lower() == "windows":
@@ -1060,93 +1396,99 @@ def generate_pricing_spreadsheets():
             region = row["Region"].lower()
             unique_skus_regions.add(f"{sku}_{region}")
     
-    print(f"Found {len(unique_skus_regions)} Windows SKU-region pairs to scrape")
+    status_lines.append(f"Found {len(unique_skus_regions)} Windows SKU-region pairs to scrape")
+    print("\n".join(status_lines))
     
     # Save skus-regions-windows.json for reference
-    with open("skus-regions-windows.json", "w") as f:
-        json.dump(list(unique_skus_regions), f, indent=4)
+    write_json(list(unique_skus_regions), "skus-regions-windows.json")
 
-    # Start both operations in parallel using threads
-    print("\n=== Phase 2: Running Azure API and Selenium scraping in parallel ===")
-    
-    estimate_rows = []
-    windows_pricing_data = {}
-    exceptions = []
-    
-    def azure_api_thread():
-        nonlocal estimate_rows
-        try:
-            print("Azure API thread started...")
-            estimate_rows, _ = build_azure_pricing(inputs)
-            print("Azure API thread completed!")
-        except Exception as e:
-            exceptions.append(("Azure API", e))
-    
-    def selenium_thread():
-        nonlocal windows_pricing_data
-        try:
-            print("Selenium scraping thread started...")
-            windows_pricing_data = scrape_windows_pricing(unique_skus_regions)
-            print("Selenium scraping thread completed!")
-        except Exception as e:
-            exceptions.append(("Selenium", e))
-    
-    # Create and start threads
-    azure_thread = threading.Thread(target=azure_api_thread)
-    selenium_thread = threading.Thread(target=selenium_thread)
-    
-    azure_thread.start()
-    selenium_thread.start()
+    # Run both stages concurrently, each fanning out on its own worker pool. (A shared
+    # FIFO pool would let the queued Retail Prices fetches hold back every vantage.sh
+    # worker, the slowest stage, until they had all been picked up.)
+    print("\n=== Phase 2: Running Azure API and vantage.sh scraping in parallel ===")
     
-    # Wait for both to complete
-    azure_thread.join()
-    selenium_thread.join()
+    with ThreadPoolExecutor(max_workers=2) as stage_executor:
+        print("Azure API stage started...")
+        azure_future = stage_executor.submit(build_azure_pricing, inputs)
+        print("vantage.sh scraping stage started...")
+        scrape_future = stage_executor.submit(scrape_windows_pricing, unique_skus_regions)
+        
+        stage_names = {azure_future: "Azure API", scrape_future: "vantage.sh scraping"}
+        exceptions = []
+        for future in as_completed(stage_names):
+            if future.exception() is None:
+                print(f"{stage_names[future]} stage completed!")
+            else:
+                exceptions.append((stage_names[future], future.exception()))
     
     # Check for exceptions
     if exceptions:
         for name, exc in exceptions:
             print(f"❌ Error in {name}: {exc}")
-        raise RuntimeError("One or more threads failed")
+        raise RuntimeError("One or more pricing stages failed")
+    
+    estimate_columns, _ = azure_future.result()
+    windows_pricing_data = scrape_future.result()
     
     print(f"\n✅ Both operations completed successfully!")
     
-    # Save Windows pricing data
-    with open('azure_windows_pricing_data.json', 'w') as f:
-        json.dump(windows_pricing_data, f, indent=4)
-    print(f"✅ Saved azure_windows_pricing_data.json")
+    # Save Windows pricing data in the background while the final tables are built
+    # (both only read windows_pricing_data)
+    with ThreadPoolExecutor(max_workers=1) as dump_pool:
+        dump_future = dump_pool.submit(
+            write_json, windows_pricing_data, "azure_windows_pricing_data.json", indent=debug, sort_keys=True
+        )
 
-    print("\n=== Building final spreadsheets ===")
-    df_estimate, df_savings, df_ranked = build_final_dataframes(estimate_rows, windows_pricing_data)
-    
-    # Save Excel files
-    df_estimate.to_excel("azure_compute_estimate.xlsx", index=False)
-    print(f"✅ Created azure_compute_estimate.xlsx with {len(df_estimate)} rows")
+        print("\n=== Building final spreadsheets ===")
+        df_estimate, df_savings, df_ranked = build_final_dataframes(estimate_columns, windows_pricing_data)
+
+        dump_future.result()
+    print(f"✅ Saved azure_windows_pricing_data.json")
     
     # For azure_savings_estimate, create with FilterMe sheet
-    with pd.ExcelWriter("azure_savings_estimate.xlsx", engine='openpyxl') as writer:
-        df_savings.to_excel(writer, index=False, sheet_name='Sheet1')
-        # Create FilterMe sheet (flattened version without blank rows)
-        # Remove rows where Description is empty (blank rows)
-        df_savings_flat = df_savings[
-            (df_savings['Description'].notna()) & 
-            (df_savings['Description'] != '')
-        ].copy()
-        df_savings_flat.to_excel(writer, index=False, sheet_name='FilterMe')
-    print(f"✅ Created azure_savings_estimate.xlsx with {len(df_savings)} rows")
-    
-    df_ranked.to_excel("ranked_vms.xlsx", index=False)
-    print(f"✅ Created ranked_vms.xlsx with {len(df_ranked)} rows")
+    # (flattened version without blank rows: remove rows where Description is empty)
+    # One NumPy pass (x == x is False for NaN); no .copy() since the writer only reads it
+    descriptions = df_savings['Description'].to_numpy(dtype=object)
+    keep = (descriptions != None) & (descriptions != '') & (descriptions == descriptions)
+    df_savings_flat = df_savings.iloc[np.flatnonzero(keep)]
     
-    # Apply formatting
-    apply_excel_formatting("azure_savings_estimate.xlsx")
-    print(f"✅ Applied formatting to azure_savings_estimate.xlsx")
+    # The estimate and ranked tables carry no formatting, so --no-xlsx writes them as CSV;
+    # the savings workbook needs its FilterMe sheet and bold rows and is always .xlsx
+    def write_table(df, name):
+        if no_xlsx:
+            df.to_csv(f"{name}.csv", index=False)
+        else:
+            write_xlsx_direct(f"{name}.xlsx", [("Sheet1", df, ())])
+
+    table_ext = "csv" if no_xlsx else "xlsx"
+
+    # Save the output files; they are independent, so write them concurrently
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        write_futures = {
+            pool.submit(write_table, df_estimate, "azure_compute_estimate"):
+                f"✅ Created azure_compute_estimate.{table_ext} with {len(df_estimate)} rows",
+            pool.submit(write_savings_workbook, df_savings, df_savings_flat, "azure_savings_estimate.xlsx"):
+                f"✅ Created azure_savings_estimate.xlsx with {len(df_savings)} rows (formatted)",
+            pool.submit(write_table, df_ranked, "ranked_vms"):
+                f"✅ Created ranked_vms.{table_ext} with {len(df_ranked)} rows",
+        }
+        # Report in the original order with one print; result() re-raises any writer
+        # error, after the files written before it have been reported
+        status_lines = []
+        try:
+            for future, message in write_futures.items():
+                future.result()
+                status_lines.append(message)
+        finally:
+            if status_lines:
+                print("\n".join(status_lines))
 
 
 ###############################################################################
 # MAIN PROGRAM
 ###############################################################################
 
-def main():
+def main(debug=False, no_xlsx=False):
     """Main program - runs both sections with user prompt between"""
     print("\n" + "="*80)
     print("AZURE RESERVATION ANALYSIS TOOL")
@@ -1167,7 +1509,8 @@ def main():
         
         if user_input in ['yes', 'y']:
             # Section 2: Generate pricing spreadsheets
-            generate_pricing_spreadsheets()
+            generate_pricing_spreadsheets(debug=debug, no_xlsx=no_xlsx)
+            table_ext = "csv" if no_xlsx else "xlsx"
             
             print("\n" + "="*80)
             print("✅ ALL PROCESSING COMPLETE!")
@@ -1175,9 +1518,9 @@ def main():
             print("\nGenerated Files:")
             print("  - output.json (VM recommendations)")
             print("  - inputs.json (Input for pricing)")
-            print("  - azure_compute_estimate.xlsx (Detailed compute-only pricing)")
+            print(f"  - azure_compute_estimate.{table_ext} (Detailed compute-only pricing)")
             print("  - azure_savings_estimate.xlsx (With vantage.sh pricing)")
-            print("  - ranked_vms.xlsx (Sorted by cost)")
+            print(f"  - ranked_vms.{table_ext} (Sorted by cost)")
             print("  - azure_windows_pricing_data.json (Windows pricing cache)")
             print("  - skus-regions-windows.json (SKU-region pairs)")
         else:
@@ -1192,5 +1535,13 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Azure reservation analysis tool")
+    parser.add_argument("--debug", action="store_true",
+                        help="pretty-print azure_windows_pricing_data.json for manual inspection")
+    parser.add_argument("--no-xlsx", action="store_true",
+                        help="write the compute estimate and ranked VM tables as CSV instead of .xlsx")
+    args = parser.parse_args()
+
+    check_and_install_dependencies()
+    main(debug=args.debug, no_xlsx=args.no_xlsx)
 